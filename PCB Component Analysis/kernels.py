@@ -0,0 +1,119 @@
+# kernels.py
+"""
+JIT-compiled geometric primitives and the inner feasibility kernel for
+the placement search. Numba lowers these to native code; if numba is not
+installed the same functions run as plain Python, just slower.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to pure Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(f): return f
+        return wrap
+
+@njit(cache=True, fastmath=True)
+def _rect_overlap(l1,t1,r1,b1,l2,t2,r2,b2):
+    if r1 <= l2 or r2 <= l1: return False
+    if b1 <= t2 or b2 <= t1: return False
+    return True
+
+@njit(cache=True, fastmath=True)
+def _seg_hits_rect(x0,y0,x1,y1,left,top,right,bottom):
+    # Slab test against the axis-aligned rect: two clips, no edge loop.
+    dx = x1 - x0; dy = y1 - y0
+    if dx != 0.0:
+        tx1 = (left - x0)/dx; tx2 = (right - x0)/dx
+        if tx2 < tx1: tx1, tx2 = tx2, tx1
+    else:
+        if x0 < left or x0 > right: return False
+        tx1, tx2 = 0.0, 1.0
+    if dy != 0.0:
+        ty1 = (top - y0)/dy; ty2 = (bottom - y0)/dy
+        if ty2 < ty1: ty1, ty2 = ty2, ty1
+    else:
+        if y0 < top or y0 > bottom: return False
+        ty1, ty2 = 0.0, 1.0
+    tmin = max(tx1, ty1, 0.0)
+    tmax = min(tx2, ty2, 1.0)
+    return tmax >= tmin
+
+@njit(cache=True)
+def _paint_rows(occ, l, t, r, b):
+    # Board columns fit in one uint64 word per row (width <= 64).
+    mask = np.uint64(((1 << (r - l)) - 1) << l)
+    for y in range(t, b):
+        occ[y] |= mask
+
+@njit(cache=True)
+def _rows_collide(occ, l, t, r, b):
+    mask = np.uint64(((1 << (r - l)) - 1) << l)
+    for y in range(t, b):
+        if occ[y] & mask: return True
+    return False
+
+def make_search_kernel(mcu_rect, board_w, board_h):
+    """
+    Specialize the feasibility kernel for a fixed MCU placement and board
+    size. The closed-over scalars are compile-time constants to Numba, so
+    every bound below lowers to an immediate operand instead of an
+    argument load.
+
+    The returned kernel runs the MCU/CRYSTAL feasibility test over a batch
+    of pre-filtered (mb_idx, usb_idx) pairs and returns
+    (pair_index_within_batch, crystal_index) of the first fully feasible
+    placement, or (-1, -1).
+    """
+    ml, mt, mr, mbm = float(mcu_rect[0]), float(mcu_rect[1]), float(mcu_rect[2]), float(mcu_rect[3])
+    mcx = (ml + mr) / 2.0; mcy = (mt + mbm) / 2.0
+    board_w = float(board_w); board_h = float(board_h)
+    bcx = board_w / 2.0; bcy = board_h / 2.0
+
+    n_rows = int(board_h)
+
+    @njit(cache=True, fastmath=True)
+    def search_kernel(pairs, mb1_rects, mb2_rects, usb_rects, seg_blocked,
+                      crystal_offsets):
+        occ = np.zeros(n_rows, dtype=np.uint64)
+        for p in range(pairs.shape[0]):
+            mb_idx = pairs[p, 0]; usb_idx = pairs[p, 1]
+            l1, t1, r1, b1 = mb1_rects[mb_idx, 0], mb1_rects[mb_idx, 1], mb1_rects[mb_idx, 2], mb1_rects[mb_idx, 3]
+            l2, t2, r2, b2 = mb2_rects[mb_idx, 0], mb2_rects[mb_idx, 1], mb2_rects[mb_idx, 2], mb2_rects[mb_idx, 3]
+            lu, tu, ru, bu = usb_rects[usb_idx, 0], usb_rects[usb_idx, 1], usb_rects[usb_idx, 2], usb_rects[usb_idx, 3]
+            if _rect_overlap(ml,mt,mr,mbm, lu,tu,ru,bu): continue
+            if _rect_overlap(ml,mt,mr,mbm, l1,t1,r1,b1): continue
+            if _rect_overlap(ml,mt,mr,mbm, l2,t2,r2,b2): continue
+            sum_x = (l1+r1)/2.0 + (l2+r2)/2.0 + (lu+ru)/2.0 + mcx
+            sum_y = (t1+b1)/2.0 + (t2+b2)/2.0 + (tu+bu)/2.0 + mcy
+            # Bit-packed occupancy: one uint64 row per board row, painted
+            # with the four placed components; each crystal candidate then
+            # collides iff any of its 5 rows ANDs non-zero. (The keepout is
+            # deliberately not painted — it only blocks the crystal-MCU
+            # segment, not placement.)
+            occ[:] = 0
+            _paint_rows(occ, int(l1), int(t1), int(r1), int(b1))
+            _paint_rows(occ, int(l2), int(t2), int(r2), int(b2))
+            _paint_rows(occ, int(lu), int(tu), int(ru), int(bu))
+            _paint_rows(occ, int(ml), int(mt), int(mr), int(mbm))
+            for c in range(crystal_offsets.shape[0]):
+                cx = mcx + crystal_offsets[c, 0]
+                cy = mcy + crystal_offsets[c, 1]
+                cl = int(cx - 2.0); ct = int(cy - 2.0)
+                cr = cl + 5.0; cb = ct + 5.0
+                if cl < 0 or ct < 0 or cr > board_w or cb > board_h: continue
+                if _rows_collide(occ, cl, ct, cl+5, ct+5): continue
+                # Offsets are pre-filtered to the 10-unit disc; no radius
+                # re-check. Keepout crossings were batch-clipped up front.
+                if seg_blocked[usb_idx, c]: continue
+                ccx = cl + 2.5; ccy = ct + 2.5
+                # Squared-distance form of |com - center| <= 2: skips the sqrt.
+                com_dx = (sum_x + ccx) / 5.0 - bcx
+                com_dy = (sum_y + ccy) / 5.0 - bcy
+                if com_dx*com_dx + com_dy*com_dy > 4.0: continue
+                return p, c
+        return -1, -1
+
+    return search_kernel
@@ -10,13 +10,16 @@ import os
 import math
 import random
 import time
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
 from typing import Tuple, List, Optional, Dict
 
-import matplotlib
-matplotlib.use('Agg')  # ensures savefig works without display
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle, Circle
+import numpy as np
+
+from kernels import make_search_kernel
+
+# matplotlib is imported lazily inside plot_solution: its ~1 s import cost
+# only belongs on runs that actually found something to plot.
 
 # Save outputs to current directory
 OUTPUT_DIR = os.getcwd()
@@ -32,7 +35,22 @@ COMP_SPECS = {
     "MB2": (5,15)
 }
 
-@dataclass
+# MCU placement never varies (pinned near board center), and the crystal
+# offset disc is constant — hoisted out of the search loops.
+MCU_X, MCU_Y = int(BOARD_CENTER[0]-2), int(BOARD_CENTER[1]-2)
+MCU_RECT = (MCU_X, MCU_Y, MCU_X+COMP_SPECS["MCU"][0], MCU_Y+COMP_SPECS["MCU"][1])
+MCU_CENTER = ((MCU_RECT[0]+MCU_RECT[2])/2.0, (MCU_RECT[1]+MCU_RECT[3])/2.0)
+# Sorted nearest-first so the first accepted crystal is also the closest
+# to the MCU; the <=100 filter already guarantees the 10-unit radius.
+CRYSTAL_OFFSETS = tuple(sorted(
+    ((dx,dy) for dx in range(-10,11) for dy in range(-10,11) if dx*dx+dy*dy <= 100),
+    key=lambda o: o[0]*o[0]+o[1]*o[1]))
+
+# The search kernel is specialized once for this problem instance: board
+# size and MCU rect are baked into the compiled code as constants.
+search_kernel = make_search_kernel(MCU_RECT, BOARD_W, BOARD_H)
+
+@dataclass(slots=True)
 class Component:
     name: str
     w: int
@@ -40,17 +58,26 @@ class Component:
     x: int = 0
     y: int = 0
     rot: int = 0
+    # Derived geometry, computed once: placement never changes after
+    # construction, and slots keep the instances __dict__-free.
+    _dims: Tuple[int,int] = field(init=False, repr=False, compare=False)
+    _rect: Tuple[int,int,int,int] = field(init=False, repr=False, compare=False)
+    _center: Tuple[float,float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        w,h = (self.w, self.h) if self.rot == 0 else (self.h, self.w)
+        self._dims = (w, h)
+        self._rect = (self.x, self.y, self.x + w, self.y + h)
+        self._center = (self.x + w/2.0, self.y + h/2.0)
 
     def placed_dims(self) -> Tuple[int,int]:
-        return (self.w, self.h) if self.rot == 0 else (self.h, self.w)
+        return self._dims
 
-    def rect(self) -> Tuple[float,float,float,float]:
-        w,h = self.placed_dims()
-        return (self.x, self.y, self.x + w, self.y + h)
+    def rect(self) -> Tuple[int,int,int,int]:
+        return self._rect
 
     def center(self) -> Tuple[float,float]:
-        w,h = self.placed_dims()
-        return (self.x + w/2.0, self.y + h/2.0)
+        return self._center
 
 # ---------- Utility functions ----------
 def distance(a, b): return math.hypot(a[0]-b[0], a[1]-b[1])
@@ -63,32 +90,34 @@ def rect_overlap(r1, r2) -> bool:
     return True
 
 def line_segment_intersects_rect(p0, p1, rect) -> bool:
+    # Slab test: clip the segment's parameter range against the x and y
+    # slabs of the axis-aligned rect; no per-edge loop, no list allocation.
     x0,y0 = p0; x1,y1 = p1
     left, top, right, bottom = rect
     dx = x1 - x0; dy = y1 - y0
-    p = [-dx, dx, -dy, dy]
-    q = [x0 - left, right - x0, y0 - top, bottom - y0]
-    u1, u2 = 0.0, 1.0
-    for pi, qi in zip(p, q):
-        if abs(pi) < 1e-12:
-            if qi < 0: return False
-            continue
-        t = qi/pi
-        if pi < 0:
-            if t > u2: return False
-            if t > u1: u1 = t
-        else:
-            if t < u1: return False
-            if t < u2: u2 = t
-    return not (u2 < u1)
+    if dx:
+        tx1 = (left - x0)/dx; tx2 = (right - x0)/dx
+        if tx2 < tx1: tx1, tx2 = tx2, tx1
+    else:
+        if x0 < left or x0 > right: return False
+        tx1, tx2 = 0.0, 1.0
+    if dy:
+        ty1 = (top - y0)/dy; ty2 = (bottom - y0)/dy
+        if ty2 < ty1: ty1, ty2 = ty2, ty1
+    else:
+        if y0 < top or y0 > bottom: return False
+        ty1, ty2 = 0.0, 1.0
+    tmin = max(tx1, ty1, 0.0)
+    tmax = min(tx2, ty2, 1.0)
+    return tmax >= tmin
 
 def inside_board(comp: Component) -> bool:
     l,t,r,b = comp.rect()
     return l >= 0 and t >= 0 and r <= BOARD_W and b <= BOARD_H
 
-def compute_usb_keepout(usb: Component):
-    l,t,r,b = usb.rect()
-    w,h = usb.placed_dims()
+def compute_usb_keepout(rect):
+    l,t,r,b = rect
+    w,h = r-l, b-t
     sides = []
     eps = 1e-6
     if abs(t - 0) < eps: sides.append('top')
@@ -110,69 +139,227 @@ def compute_usb_keepout(usb: Component):
         top = cy-5; bottom = cy+5; right = cx; left = cx-15
     return (max(0,left), max(0,top), min(BOARD_W,right), min(BOARD_H,bottom))
 
+def compute_usb_keepouts(rects: np.ndarray) -> np.ndarray:
+    """Vectorized compute_usb_keepout over an (M,4) array of USB rects.
+
+    Must agree with the scalar version above (same edge priority:
+    top, bottom, left, right, defaulting to top).
+    """
+    l,t,r,b = rects.astype(np.float64).T
+    cx = (l+r)/2.0; cy = (t+b)/2.0
+    conds = [t == 0, b == BOARD_H, l == 0, r == BOARD_W]
+    kl = np.select(conds, [cx-5, cx-5, l,    r-15], cx-5)
+    kt = np.select(conds, [t,    b-15, cy-5, cy-5], t)
+    kr = np.select(conds, [cx+5, cx+5, l+15, r   ], cx+5)
+    kb = np.select(conds, [t+15, b,    cy+5, cy+5], t+15)
+    return np.stack([np.maximum(kl,0), np.maximum(kt,0),
+                     np.minimum(kr,BOARD_W), np.minimum(kb,BOARD_H)], axis=1)
+
+def segment_blocked_mask(keepouts: np.ndarray, centers: np.ndarray, end: Tuple[float,float]) -> np.ndarray:
+    """Vectorized slab clip: mask[m,c] is True when the segment from crystal
+    center c to `end` (the MCU center) crosses keepout rect m."""
+    x0 = centers[:,0][None,:]; y0 = centers[:,1][None,:]
+    x1,y1 = end
+    l = keepouts[:,0][:,None]; t = keepouts[:,1][:,None]
+    r = keepouts[:,2][:,None]; b = keepouts[:,3][:,None]
+    dx = x1 - x0; dy = y1 - y0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tx1 = (l - x0)/dx; tx2 = (r - x0)/dx
+        ty1 = (t - y0)/dy; ty2 = (b - y0)/dy
+    txlo = np.minimum(tx1,tx2); txhi = np.maximum(tx1,tx2)
+    tylo = np.minimum(ty1,ty2); tyhi = np.maximum(ty1,ty2)
+    # Degenerate slabs (segment parallel to an axis): unconstrained when the
+    # segment lies inside the slab, empty otherwise.
+    deg_x = dx == 0; inside_x = (x0 >= l) & (x0 <= r)
+    txlo = np.where(deg_x, np.where(inside_x, -np.inf, np.inf), txlo)
+    txhi = np.where(deg_x, np.where(inside_x, np.inf, -np.inf), txhi)
+    deg_y = dy == 0; inside_y = (y0 >= t) & (y0 <= b)
+    tylo = np.where(deg_y, np.where(inside_y, -np.inf, np.inf), tylo)
+    tyhi = np.where(deg_y, np.where(inside_y, np.inf, -np.inf), tyhi)
+    tmin = np.maximum(np.maximum(txlo,tylo), 0.0)
+    tmax = np.minimum(np.minimum(txhi,tyhi), 1.0)
+    return tmax >= tmin
+
 def center_of_mass(comps: List[Component]):
-    xs = [c.center()[0] for c in comps]
-    ys = [c.center()[1] for c in comps]
-    return (sum(xs)/len(xs), sum(ys)/len(ys))
+    sx = sy = 0.0
+    for c in comps:
+        cx,cy = c.center()
+        sx += cx; sy += cy
+    return (sx/len(comps), sy/len(comps))
 
 # ---------- Candidate generators ----------
+def placement_rect(x, y, rot, name) -> Tuple[int,int,int,int]:
+    w,h = COMP_SPECS[name]
+    pw,ph = (w,h) if rot == 0 else (h,w)
+    return (x, y, x+pw, y+ph)
+
+def rects_inside_board(rects: np.ndarray) -> np.ndarray:
+    return (rects[:,0] >= 0) & (rects[:,1] >= 0) & (rects[:,2] <= BOARD_W) & (rects[:,3] <= BOARD_H)
+
+def pairwise_no_overlap(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N,M) mask: True where rect a[i] and rect b[j] are disjoint."""
+    l1,t1,r1,b1 = a.T[:,:,None]
+    l2,t2,r2,b2 = b.T[:,None,:]
+    return (r1 <= l2) | (r2 <= l1) | (b1 <= t2) | (b2 <= t1)
+
 def generate_mb_mirrored_positions(step=1):
+    """Emit (orient, mb1, mb2) with each MB as a flat (l,t,r,b,rot) tuple.
+
+    Only one representative per symmetry class is emitted: MB1 is always on
+    the lower-coordinate edge (the MB1/MB2 swap is equivalent for identical
+    rails), and placements that are the reflection of an earlier one along
+    the rail axis are skipped.
+    """
     positions=[]
     w,h = COMP_SPECS["MB1"]
     for y in range(0, BOARD_H-h+1, step):
-        mb1=(0,y,0); mb2=(BOARD_W-w,y,0)
+        if y > BOARD_H-h-y: continue  # mirror of an already-emitted y
+        mb1=placement_rect(0,y,0,"MB1")+(0,); mb2=placement_rect(BOARD_W-w,y,0,"MB2")+(0,)
         positions.append(('vertical',mb1,mb2))
     for x in range(0, BOARD_W-h+1, step):
-        mb1=(x,0,90); mb2=(x,BOARD_H-w,90)
+        if x > BOARD_W-h-x: continue  # mirror of an already-emitted x
+        mb1=placement_rect(x,0,90,"MB1")+(90,); mb2=placement_rect(x,BOARD_H-w,90,"MB2")+(90,)
         positions.append(('horizontal',mb1,mb2))
     return positions
 
 def generate_usb_edge_positions(step=1):
+    """Emit USB candidates as (l,t,r,b,rot,keepout) tuples along the four edges."""
     w,h=COMP_SPECS["USB"]; pos=[]
+    def cand(x,y,rot):
+        rect=placement_rect(x,y,rot,"USB")
+        return rect+(rot,compute_usb_keepout(rect))
     for x in range(0,BOARD_W-w+1,step):
-        pos.append((x,0,0)); pos.append((x,BOARD_H-h,0))
+        pos.append(cand(x,0,0)); pos.append(cand(x,BOARD_H-h,0))
     for y in range(0,BOARD_H-h+1,step):
-        pos.append((0,y,90)); pos.append((BOARD_W-w,y,90))
+        pos.append(cand(0,y,90)); pos.append(cand(BOARD_W-w,y,90))
     return pos
 
 # ---------- Main search ----------
-def find_solution(time_limit=1.9, seed=42) -> Optional[Dict]:
-    random.seed(seed); start=time.time()
+def _search_pair_span(pairs_slice, mb1_f, mb2_f, usb_f, seg_blocked, offsets_f):
+    """Worker: run the kernel over one contiguous slice of candidate pairs."""
+    return search_kernel(pairs_slice, mb1_f, mb2_f, usb_f, seg_blocked, offsets_f)
+
+def find_solution(time_limit=1.9, seed=42, workers=1) -> Optional[Dict]:
+    # Integer deadline: monotonic_ns is one VDSO read and an int compare
+    # per poll, with no float subtraction in the loop.
+    random.seed(seed); deadline_ns=time.monotonic_ns()+int(time_limit*1e9)
     mb_positions=generate_mb_mirrored_positions()
     usb_positions=generate_usb_edge_positions()
-    crystal_offsets=[(dx,dy) for dx in range(-10,11) for dy in range(-10,11) if dx*dx+dy*dy<=100]
-    for orient,mb1p,mb2p in mb_positions:
-        if time.time()-start>time_limit: break
-        mb1=Component("MB1",*COMP_SPECS["MB1"],x=mb1p[0],y=mb1p[1],rot=mb1p[2])
-        mb2=Component("MB2",*COMP_SPECS["MB2"],x=mb2p[0],y=mb2p[1],rot=mb2p[2])
-        if not (inside_board(mb1) and inside_board(mb2)): continue
-        if rect_overlap(mb1.rect(),mb2.rect()): continue
-        for usbp in usb_positions:
-            if time.time()-start>time_limit: break
-            usb=Component("USB",*COMP_SPECS["USB"],x=usbp[0],y=usbp[1],rot=usbp[2])
-            if not inside_board(usb): continue
-            if any(rect_overlap(usb.rect(),o.rect()) for o in (mb1,mb2)): continue
-            keepout=compute_usb_keepout(usb)
-            # MCU near center
-            mx,my=int(BOARD_CENTER[0]-2),int(BOARD_CENTER[1]-2)
-            mcu=Component("MCU",*COMP_SPECS["MCU"],x=mx,y=my)
-            if any(rect_overlap(mcu.rect(),o.rect()) for o in (usb,mb1,mb2)): continue
-            for dx,dy in crystal_offsets:
-                cx,cy=mcu.center()[0]+dx,mcu.center()[1]+dy
-                cryst=Component("CRYSTAL",*COMP_SPECS["CRYSTAL"],x=int(cx-2),y=int(cy-2))
-                if not inside_board(cryst): continue
-                if any(rect_overlap(cryst.rect(),o.rect()) for o in (usb,mb1,mb2,mcu)): continue
-                if distance(cryst.center(),mcu.center())>10: continue
-                if line_segment_intersects_rect(cryst.center(),mcu.center(),keepout): continue
-                comps=[usb,mb1,mb2,mcu,cryst]
-                com=center_of_mass(comps)
-                if distance(com,BOARD_CENTER)>2: continue
-                return {'USB':usb,'MB1':mb1,'MB2':mb2,'MCU':mcu,'CRYSTAL':cryst,'keepout':keepout,'com':com}
+    # Value ordering: candidates whose (pair-)center sits nearest the board
+    # center are the most likely to satisfy the COM constraint, so try the
+    # central ones first and reach a feasible leaf sooner.
+    mb_positions.sort(key=lambda p:
+        (p[1][0]+p[1][2]+p[2][0]+p[2][2]-4*BOARD_CENTER[0])**2
+        +(p[1][1]+p[1][3]+p[2][1]+p[2][3]-4*BOARD_CENTER[1])**2)
+    usb_positions.sort(key=lambda p:
+        (p[0]+p[2]-2*BOARD_CENTER[0])**2+(p[1]+p[3]-2*BOARD_CENTER[1])**2)
+    # Vectorized pre-filter: build all candidate rects as int16 arrays and
+    # keep only (MB pair, USB) combinations that are on-board and disjoint.
+    mb1_rects=np.array([p[1][:4] for p in mb_positions],dtype=np.int16)
+    mb2_rects=np.array([p[2][:4] for p in mb_positions],dtype=np.int16)
+    usb_rects=np.array([p[:4] for p in usb_positions],dtype=np.int16)
+    mb_pair_disjoint=(
+        (mb1_rects[:,2]<=mb2_rects[:,0])|(mb2_rects[:,2]<=mb1_rects[:,0])|
+        (mb1_rects[:,3]<=mb2_rects[:,1])|(mb2_rects[:,3]<=mb1_rects[:,1]))
+    mb_ok=rects_inside_board(mb1_rects)&rects_inside_board(mb2_rects)&mb_pair_disjoint
+    usb_ok=rects_inside_board(usb_rects)
+    # MBs sit flush to opposite edges and share their long-axis span, so a
+    # USB can only hit one by reaching into a 5-wide edge strip while its
+    # long-axis interval intersects the pair's: one strip test plus one
+    # interval test replaces the two generic 4-comparison overlap masks.
+    strip_w=COMP_SPECS["MB1"][0]
+    vert=np.array([p[0]=='vertical' for p in mb_positions])
+    in_x_strip=(usb_rects[:,0]<strip_w)|(usb_rects[:,2]>BOARD_W-strip_w)
+    in_y_strip=(usb_rects[:,1]<strip_w)|(usb_rects[:,3]>BOARD_H-strip_w)
+    strip=np.where(vert[:,None],in_x_strip[None,:],in_y_strip[None,:])
+    long_lo=np.where(vert,mb1_rects[:,1],mb1_rects[:,0])
+    long_hi=np.where(vert,mb1_rects[:,3],mb1_rects[:,2])
+    u_lo=np.where(vert[:,None],usb_rects[None,:,1],usb_rects[None,:,0])
+    u_hi=np.where(vert[:,None],usb_rects[None,:,3],usb_rects[None,:,2])
+    usb_hits_mb=strip&(u_lo<long_hi[:,None])&(u_hi>long_lo[:,None])
+    compat=mb_ok[:,None]&usb_ok[None,:]&~usb_hits_mb
+    # Forward checking on the center-of-mass constraint: with MB pair, MCU
+    # and USB fixed, the 5-component COM can only be reached if the crystal
+    # center can still pull the partial sum into [5*(c-2), 5*(c+2)] on both
+    # axes. Prune pairs whose interval can't intersect that range.
+    cr_x_lo=max(MCU_CENTER[0]-10, 2.5); cr_x_hi=min(MCU_CENTER[0]+10, BOARD_W-2.5)
+    cr_y_lo=max(MCU_CENTER[1]-10, 2.5); cr_y_hi=min(MCU_CENTER[1]+10, BOARD_H-2.5)
+    part_x=(mb1_rects[:,0]+mb1_rects[:,2]+mb2_rects[:,0]+mb2_rects[:,2])/2.0+MCU_CENTER[0]
+    part_y=(mb1_rects[:,1]+mb1_rects[:,3]+mb2_rects[:,1]+mb2_rects[:,3])/2.0+MCU_CENTER[1]
+    usb_cx=(usb_rects[:,0]+usb_rects[:,2])/2.0
+    usb_cy=(usb_rects[:,1]+usb_rects[:,3])/2.0
+    px=part_x[:,None]+usb_cx[None,:]; py=part_y[:,None]+usb_cy[None,:]
+    lo_x,hi_x=5*(BOARD_CENTER[0]-2),5*(BOARD_CENTER[0]+2)
+    lo_y,hi_y=5*(BOARD_CENTER[1]-2),5*(BOARD_CENTER[1]+2)
+    compat&=((px+cr_x_hi>=lo_x)&(px+cr_x_lo<=hi_x)
+             &(py+cr_y_hi>=lo_y)&(py+cr_y_lo<=hi_y))
+    pairs=np.argwhere(compat)
+    # Keepouts for all USB candidates in one vectorized pass.
+    usb_keepouts=compute_usb_keepouts(usb_rects)
+    mb1_f=mb1_rects.astype(np.float64); mb2_f=mb2_rects.astype(np.float64)
+    usb_f=usb_rects.astype(np.float64)
+    offsets_f=np.array(CRYSTAL_OFFSETS,dtype=np.float64)
+    # Batch slab-clip: for every (USB keepout, crystal offset) decide up
+    # front whether the crystal-MCU segment crosses the keepout, so the
+    # kernel's inner loop just indexes a bool. Centers are snapped exactly
+    # as the kernel snaps them (int truncation of the top-left corner).
+    cryst_centers=np.array([(int(MCU_CENTER[0]+dx-2)+2.5,int(MCU_CENTER[1]+dy-2)+2.5)
+                            for dx,dy in CRYSTAL_OFFSETS])
+    seg_blocked=segment_blocked_mask(usb_keepouts,cryst_centers,MCU_CENTER)
+    def accept(pair_idx,c):
+        # The single accepted candidate is the only place Components exist.
+        mb_idx,usb_idx=pairs[pair_idx]
+        orient,mb1p,mb2p=mb_positions[mb_idx]
+        usbp=usb_positions[usb_idx]
+        mb1=Component("MB1",*COMP_SPECS["MB1"],x=mb1p[0],y=mb1p[1],rot=mb1p[4])
+        mb2=Component("MB2",*COMP_SPECS["MB2"],x=mb2p[0],y=mb2p[1],rot=mb2p[4])
+        usb=Component("USB",*COMP_SPECS["USB"],x=usbp[0],y=usbp[1],rot=usbp[4])
+        keepout=usbp[5]
+        mcu=Component("MCU",*COMP_SPECS["MCU"],x=MCU_X,y=MCU_Y)
+        dx,dy=CRYSTAL_OFFSETS[c]
+        cx,cy=mcu.center()[0]+dx,mcu.center()[1]+dy
+        cryst=Component("CRYSTAL",*COMP_SPECS["CRYSTAL"],x=int(cx-2),y=int(cy-2))
+        com=center_of_mass([usb,mb1,mb2,mcu,cryst])
+        return {'USB':usb,'MB1':mb1,'MB2':mb2,'MCU':mcu,'CRYSTAL':cryst,'keepout':keepout,'com':com}
+    if workers>1:
+        # Parallel sweep: one contiguous slice of pairs per worker. Futures
+        # are consumed in submission order, so the result is the same
+        # placement the sequential sweep would return first.
+        span=-(-len(pairs)//workers)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs=[(s,ex.submit(_search_pair_span,pairs[s:s+span],mb1_f,mb2_f,
+                               usb_f,seg_blocked,offsets_f))
+                  for s in range(0,len(pairs),span)]
+            for s,fut in futs:
+                try:
+                    p,c=fut.result(timeout=max(0.0,(deadline_ns-time.monotonic_ns())/1e9))
+                except FutureTimeout:
+                    for _,f in futs: f.cancel()
+                    return None
+                if p>=0:
+                    for _,f in futs: f.cancel()
+                    return accept(s+p,c)
+        return None
+    # Single flat loop over pair batches: one kernel call and one clock
+    # poll per 1024 candidates instead of per-iteration checks in nested
+    # Python frames.
+    CHUNK=1024
+    for s in range(0,len(pairs),CHUNK):
+        if time.monotonic_ns()>deadline_ns: break
+        p,c=search_kernel(pairs[s:s+CHUNK],mb1_f,mb2_f,usb_f,seg_blocked,offsets_f)
+        if p>=0: return accept(s+p,c)
     return None
 
 # ---------- Plotting & Summary ----------
 def plot_solution(sol:Dict,fname="pcb_solution.png"):
-    fig,ax=plt.subplots(figsize=(6,6))
+    # Drive the Agg canvas directly instead of going through pyplot's
+    # global state machine; works headless without matplotlib.use('Agg').
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.patches import Rectangle
+    fig=Figure(figsize=(6,6))
+    FigureCanvasAgg(fig)
+    ax=fig.add_subplot()
     ax.add_patch(Rectangle((0,0),BOARD_W,BOARD_H,fill=False,lw=2))
     colors={'USB':'red','MCU':'blue','CRYSTAL':'orange','MB1':'purple','MB2':'green'}
     for name in ('USB','MB1','MB2','MCU','CRYSTAL'):
@@ -183,8 +370,8 @@ def plot_solution(sol:Dict,fname="pcb_solution.png"):
     ax.add_patch(Rectangle((l,t),r-l,b-t,facecolor='red',alpha=0.2))
     ax.set_xlim(0,BOARD_W); ax.set_ylim(0,BOARD_H); ax.set_aspect('equal')
     ax.invert_yaxis()
-    plt.tight_layout()
-    plt.savefig(fname,dpi=200); plt.close(fig)
+    fig.tight_layout()
+    fig.savefig(fname,dpi=200)
 
 def save_summary(sol:Dict,fname="pcb_solution_summary.txt"):
     with open(fname,"w") as f: